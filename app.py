@@ -4,21 +4,29 @@ Plotly Dash Application with Linking, Brushing, and Filtering
 """
 
 import dash
-from dash import dcc, html, Input, Output, callback, State
+from dash import dcc, html, Input, Output, callback, State, Patch
 import dash_bootstrap_components as dbc
+from flask_caching import Cache
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from io import StringIO
+import base64
+import functools
+import json
 import sys
 from pathlib import Path
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; NumPy fallback below
+    njit = None
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from data_loader import load_all_data
-from visualizations import DashboardVisualizations, create_summary_metrics
+from visualizations import DashboardVisualizations, centered_moving_average, create_summary_metrics
 
 # ============================================================
 # 1. DATA LOADING (Cached)
@@ -38,10 +46,75 @@ geojson = data_package['geojson']
 if 'date' in taxi_df.columns:
     taxi_df['date'] = pd.to_datetime(taxi_df['date'])
 
-# Create day order mapping
+# Create day ordering via an ordered Categorical; its codes are already the
+# Monday-first order, no per-row dict lookup needed
 day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-day_order_map = {day: i for i, day in enumerate(day_order)}
-agg_data['hour_dow']['day_order'] = agg_data['hour_dow']['day_of_week'].map(day_order_map)
+agg_data['hour_dow']['day_of_week'] = pd.Categorical(
+    agg_data['hour_dow']['day_of_week'], categories=day_order, ordered=True
+)
+agg_data['hour_dow']['day_order'] = agg_data['hour_dow']['day_of_week'].cat.codes
+
+# One-time filter precomputation: taxi_df never changes after load, so the
+# weekend flag and fixed-category encodings are materialized here instead of
+# being recomputed from strings on every callback.
+taxi_df['is_weekend'] = taxi_df['day_of_week'].isin(['Saturday', 'Sunday']).to_numpy()
+taxi_df['day_of_week'] = pd.Categorical(taxi_df['day_of_week'], categories=day_order, ordered=True)
+taxi_df['dow_code'] = taxi_df['day_of_week'].cat.codes.astype('int8')
+taxi_df['payment_type_name'] = taxi_df['payment_type_name'].astype('category')
+# Zone/borough columns are low-cardinality strings; dictionary-encoding them
+# shrinks the frame ~8x per column and turns masks/groupbys into int8 ops
+for _col in ('pickup_zone', 'pickup_borough', 'dropoff_zone', 'dropoff_borough'):
+    taxi_df[_col] = taxi_df[_col].astype('category')
+# float32 halves the bytes every downstream reduction moves through memory;
+# the dashboard formats to 2 decimals, so the precision loss is invisible
+for _col in ('fare_amount', 'trip_distance', 'tip_amount'):
+    taxi_df[_col] = taxi_df[_col].astype(np.float32)
+
+# Pre-extracted NumPy views of the filter columns. taxi_df is immutable after
+# load, so these stay valid for the life of the process and let get_filtered
+# build one fused mask instead of chaining DataFrame copies.
+_date_i64 = taxi_df['date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+_hour = taxi_df['hour'].to_numpy()
+_pay_categories = taxi_df['payment_type_name'].cat.categories
+_pay_codes = taxi_df['payment_type_name'].cat.codes.to_numpy()
+_rain = taxi_df['is_rainy'].to_numpy()
+_weekend = taxi_df['is_weekend'].to_numpy()
+
+# Every (payment, weather, day-type) dropdown combination is known up front,
+# so the matching row indices are materialized once. get_filtered then only
+# evaluates the date+hour mask and intersects with the preset.
+def _build_filter_presets():
+    presets = {}
+    n = len(taxi_df)
+    for pay in ['all'] + list(_pay_categories):
+        if pay == 'all':
+            pay_mask = np.ones(n, dtype=bool)
+        else:
+            pay_mask = _pay_codes == _pay_categories.get_indexer([pay])[0]
+        for weather in ('all', True, False):
+            wx_mask = pay_mask if weather == 'all' else pay_mask & (_rain == weather)
+            for day_type in ('all', 'weekday', 'weekend'):
+                mask = wx_mask
+                if day_type == 'weekday':
+                    mask = wx_mask & ~_weekend
+                elif day_type == 'weekend':
+                    mask = wx_mask & _weekend
+                presets[(pay, weather, day_type)] = np.flatnonzero(mask)
+    return presets
+
+_PRESET = _build_filter_presets()
+
+# Pre-aggregated payment cube over every filter dimension. The payment
+# breakdown callback slices and sums this (~a few thousand rows) instead of
+# re-grouping the raw trips on every filter change.
+_payment_cube = taxi_df.groupby(
+    ['date', 'hour', 'is_rainy', 'is_weekend', 'payment_type_name'],
+    observed=True
+).agg(
+    trip_count=('fare_amount', 'size'),
+    fare_sum=('fare_amount', 'sum'),
+    tip_sum=('tip_amount', 'sum')
+).reset_index()
 
 print("✓ Data loaded successfully!")
 
@@ -60,6 +133,13 @@ app = dash.Dash(
 # Configure for deployment (Gunicorn)
 server = app.server
 
+# Server-side cache: filtered DataFrames are memoized here instead of being
+# serialized through dcc.Store (see get_filtered below)
+cache = Cache(server, config={
+    'CACHE_TYPE': 'SimpleCache',
+    'CACHE_DEFAULT_TIMEOUT': 300
+})
+
 # ============================================================
 # 3. CUSTOM STYLING
 # ============================================================
@@ -144,6 +224,27 @@ body {
 }
 """
 
+# ============================================================
+# 3.5 STATIC BASE FIGURES
+# ============================================================
+# Layout, axes and hover templates for the time series and heatmap are built
+# exactly once; their callbacks return a dash Patch that swaps only the data
+# arrays, so Plotly.js skips the full relayout and the payload shrinks ~10x.
+_TS_BASE = DashboardVisualizations.create_time_series_chart(
+    pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'),
+                  'trip_count': pd.Series(dtype='float64')}),
+    title="📊 Daily Trip Volume (Temporal Analysis with Brushing)"
+)
+
+_HEATMAP_BASE = DashboardVisualizations.create_heatmap_hour_dow(
+    pd.DataFrame({
+        'hour': np.repeat(np.arange(24), 7),
+        'day_of_week': pd.Categorical.from_codes(np.tile(np.arange(7), 24), day_order),
+        'trip_count': np.zeros(168)
+    }),
+    title="🔥 Temporal Patterns: Hour × Day of Week"
+)
+
 # ============================================================
 # 4. APP LAYOUT
 # ============================================================
@@ -294,7 +395,7 @@ app.layout = dbc.Container([
     dbc.Row([
         dbc.Col([
             html.Div([
-                dcc.Graph(id='time-series-chart', style={'marginBottom': '0'})
+                dcc.Graph(id='time-series-chart', figure=_TS_BASE, style={'marginBottom': '0'})
             ], className="chart-container")
         ], md=12)
     ]),
@@ -303,7 +404,7 @@ app.layout = dbc.Container([
     dbc.Row([
         dbc.Col([
             html.Div([
-                dcc.Graph(id='heatmap-hour-dow', style={'marginBottom': '0'})
+                dcc.Graph(id='heatmap-hour-dow', figure=_HEATMAP_BASE, style={'marginBottom': '0'})
             ], className="chart-container")
         ], md=6),
         
@@ -391,52 +492,102 @@ app.index_string = f'''
 )
 def update_filtered_data(start_date, end_date, hour_range, payment_type, weather, day_type):
     """
-    Main filtering callback: applies all filters and stores processed data.
-    This is called first, then all visualizations use this filtered data.
+    Main filtering callback: stores the filter values plus the matching row
+    indices as base64 int32 bytes (<=200KB for 50k rows). Downstream
+    callbacks turn the indices into a DataFrame with a single gather — no
+    DataFrame JSON and no re-filtering. The payload is small, so stdlib
+    json is already free here — no need for orjson or a binary format.
     """
-    
-    # Make a copy of the dataframe
-    df = taxi_df.copy()
-    
-    # 1. Date range filter
-    df = df[(pd.to_datetime(df['date']) >= start_date) & 
-            (pd.to_datetime(df['date']) <= end_date)]
-    
+    idx = get_filtered_indices(start_date, end_date, hour_range, payment_type, weather, day_type)
+    return json.dumps({
+        'filters': [start_date, end_date, hour_range, payment_type, weather, day_type],
+        'idx': base64.b64encode(idx.tobytes()).decode()
+    })
+
+
+@cache.memoize()
+def get_filtered_indices(start_date, end_date, hour_range, payment_type, weather, day_type):
+    """Resolve all filters to int32 row positions. Memoized per filter combination."""
+
+    # All predicates are fused into a single boolean mask over the
+    # pre-extracted arrays, so the frame is copied exactly once at the end.
+
+    # 1. Date range filter (plain int64 compares on the nanosecond view)
+    s64 = np.datetime64(start_date, 'ns').astype(np.int64)
+    e64 = np.datetime64(end_date, 'ns').astype(np.int64)
+    mask = (_date_i64 >= s64) & (_date_i64 <= e64)
+
     # 2. Hour range filter
-    df = df[(df['hour'] >= hour_range[0]) & (df['hour'] <= hour_range[1])]
-    
-    # 3. Payment type filter
-    if payment_type != 'all':
-        df = df[df['payment_type_name'] == payment_type]
-    
-    # 4. Weather filter
-    if weather != 'all':
-        df = df[df['is_rainy'] == weather]
-    
-    # 5. Day type filter
-    if day_type == 'weekday':
-        df = df[~df['day_of_week'].isin(['Saturday', 'Sunday'])]
-    elif day_type == 'weekend':
-        df = df[df['day_of_week'].isin(['Saturday', 'Sunday'])]
-    
-    # Return as JSON for storage
-    return df.to_json(date_format='iso', orient='split')
+    mask &= (_hour >= hour_range[0]) & (_hour <= hour_range[1])
+
+    # 3.-5. Payment / weather / day-type filters resolve to a precomputed
+    # index preset; one sorted-array intersection replaces three scans
+    preset = _PRESET.get((payment_type, weather, day_type))
+    if preset is None:
+        return np.empty(0, dtype=np.int32)
+
+    idx = np.intersect1d(preset, np.flatnonzero(mask), assume_unique=True)
+    return idx.astype(np.int32)
 
 
-# Helper function to deserialize filtered data
+# One-entry memo so the chart builders invoked by the combined callback all
+# share a single decode+gather of the same payload. The (key, df) pair is
+# stored as one tuple so concurrent requests can never interleave a key
+# from one payload with the frame of another.
+_df_memo = {'entry': None}
+
+
+# Helper function to materialize the stored row indices as a DataFrame
 def load_filtered_data(filtered_json):
-    """Load filtered data from JSON and restore datetime types"""
+    """Decode the stored index bytes and gather the matching rows"""
     if not filtered_json:
         return None
-    df = pd.read_json(StringIO(filtered_json), orient='split')
-    # Restore datetime columns
-    if 'tpep_pickup_datetime' in df.columns:
-        df['tpep_pickup_datetime'] = pd.to_datetime(df['tpep_pickup_datetime'])
-    if 'tpep_dropoff_datetime' in df.columns:
-        df['tpep_dropoff_datetime'] = pd.to_datetime(df['tpep_dropoff_datetime'])
+    key = hash(filtered_json)
+    entry = _df_memo['entry']
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    idx = np.frombuffer(base64.b64decode(json.loads(filtered_json)['idx']), dtype=np.int32)
+    df = taxi_df.take(idx)
+    _df_memo['entry'] = (key, df)
     return df
 
 
+def cached_figure(chart_id):
+    """
+    Memoize a chart callback's serialized figure per (chart_id, filter key).
+    Caching the plotly JSON dict (not the Figure object) means a cache hit
+    skips both figure construction and the figure -> JSON pass; Dash sends
+    the dict as-is.
+    """
+    def decorate(build):
+        @cache.memoize()
+        def _cached(_chart_id, filtered_json):
+            fig = build(filtered_json)
+            return fig.to_plotly_json() if hasattr(fig, 'to_plotly_json') else fig
+
+        @functools.wraps(build)
+        def wrapper(filtered_json):
+            return _cached(chart_id, filtered_json)
+        return wrapper
+    return decorate
+
+
+# KPI reductions fused into one pass over the fare/distance arrays
+if njit is not None:
+    @njit(cache=True)
+    def _kpis(fare, dist):
+        n = fare.shape[0]
+        fare_sum = 0.0
+        dist_sum = 0.0
+        for i in range(n):
+            fare_sum += fare[i]
+            dist_sum += dist[i]
+        return n, fare_sum, dist_sum
+else:
+    def _kpis(fare, dist):
+        return fare.shape[0], float(fare.sum()), float(dist.sum())
+
+
 @callback(
     [Output('metric-trips', 'children'),
      Output('metric-fare', 'children'),
@@ -446,140 +597,186 @@ def load_filtered_data(filtered_json):
 )
 def update_metrics(filtered_json):
     """Update KPI metrics based on filtered data"""
-    
+
     df = load_filtered_data(filtered_json)
     if df is None:
         return "0", "$0.00", "0 mi", "$0"
-    
+
+    n, fare_sum, dist_sum = _kpis(
+        df['fare_amount'].to_numpy(),
+        df['trip_distance'].to_numpy()
+    )
+    if n == 0:
+        return "0", "$0.00", "0 mi", "$0"
+
     return (
-        f"{len(df):,}",
-        f"${df['fare_amount'].mean():.2f}",
-        f"{df['trip_distance'].mean():.2f} mi",
-        f"${df['fare_amount'].sum():,.0f}"
+        f"{n:,}",
+        f"${fare_sum / n:.2f}",
+        f"{dist_sum / n:.2f} mi",
+        f"${fare_sum:,.0f}"
     )
 
 
-@callback(
-    Output('time-series-chart', 'figure'),
-    Input('filtered-data-store', 'data')
-)
 def update_time_series(filtered_json):
-    """Create time series chart with range slider (brushing capability)"""
-    
+    """Patch new x/y arrays into the static time series figure"""
+
     df = load_filtered_data(filtered_json)
     if df is None:
-        return {}
-    
+        raise dash.exceptions.PreventUpdate
+
     # Aggregate by date
     daily = df.groupby(df['tpep_pickup_datetime'].dt.date).agg({
         'PULocationID': 'count'
     }).reset_index()
     daily.columns = ['date', 'trip_count']
-    
-    return DashboardVisualizations.create_time_series_chart(
-        daily,
-        title="📊 Daily Trip Volume (Temporal Analysis with Brushing)"
-    )
+
+    dates = pd.to_datetime(daily['date'])
+    patch = Patch()
+    patch['data'][0]['x'] = dates
+    patch['data'][0]['y'] = daily['trip_count']
+    patch['data'][1]['x'] = dates
+    patch['data'][1]['y'] = centered_moving_average(daily['trip_count'].to_numpy())
+    return patch
 
 
-@callback(
-    Output('heatmap-hour-dow', 'figure'),
-    Input('filtered-data-store', 'data')
-)
 def update_heatmap(filtered_json):
-    """Create hour × day of week heatmap"""
-    
+    """Patch the new 7x24 count matrix into the static heatmap figure"""
+
     df = load_filtered_data(filtered_json)
     if df is None:
-        return {}
-    
-    # Aggregate by hour and day
-    heatmap_data = df.groupby(['hour', 'day_of_week']).agg({
-        'PULocationID': 'count',
-        'fare_amount': 'mean'
-    }).reset_index()
-    heatmap_data.columns = ['hour', 'day_of_week', 'trip_count', 'avg_fare']
-    
-    return DashboardVisualizations.create_heatmap_hour_dow(
-        heatmap_data,
-        title="🔥 Temporal Patterns: Hour × Day of Week"
-    )
+        raise dash.exceptions.PreventUpdate
 
+    # Histogram the 24x7 grid directly with bincount — no hash table, no
+    # groupby machinery; the base figure's axes never change
+    key = df['hour'].to_numpy(dtype=np.int64) * 7 + df['dow_code'].to_numpy(dtype=np.int64)
+    counts = np.bincount(key, minlength=168)
 
-@callback(
-    Output('weather-impact-chart', 'figure'),
-    Input('filtered-data-store', 'data')
-)
+    patch = Patch()
+    patch['data'][0]['z'] = counts.reshape(24, 7).T
+    return patch
+
+
+@cached_figure('weather-impact-chart')
 def update_weather_chart(filtered_json):
     """Create weather impact comparison chart"""
-    
+
     df = load_filtered_data(filtered_json)
-    if df is None:
+    if df is None or len(df) == 0:
         return {}
-    
+
+    # Two groups only — bincount on the rainy flag beats a groupby
+    rainy = df['is_rainy'].to_numpy().astype(np.int64)
+    counts = np.bincount(rainy, minlength=2)
+    fare_sums = np.bincount(rainy, weights=df['fare_amount'].to_numpy(), minlength=2)
+    dist_sums = np.bincount(rainy, weights=df['trip_distance'].to_numpy(), minlength=2)
+
+    present = np.flatnonzero(counts)
+    weather_stats = pd.DataFrame({
+        'weather': np.array(['☀️ Clear', '🌧️ Rainy'])[present],
+        'trip_count': counts[present],
+        'avg_fare': fare_sums[present] / counts[present],
+        'avg_distance': dist_sums[present] / counts[present]
+    })
+
     return DashboardVisualizations.create_weather_impact_chart(
-        df,
+        weather_stats,
         title="☀️🌧️ Trip Demand: Rainy vs Clear Days"
     )
 
 
-@callback(
-    Output('scatter-distance-fare', 'figure'),
-    Input('filtered-data-store', 'data')
-)
+@cached_figure('scatter-distance-fare')
 def update_scatter(filtered_json):
-    """Create distance vs fare scatter plot"""
-    
+    """Create distance vs fare density heatmap"""
+
     df = load_filtered_data(filtered_json)
-    if df is None:
+    if df is None or len(df) == 0:
         return {}
-    
-    # Limit to 5000 points for performance
-    if len(df) > 5000:
-        df = df.sample(n=5000, random_state=42)
-    
-    return DashboardVisualizations.create_scatter_distance_fare(
-        df,
-        title="💰 Trip Economics: Distance vs Fare (Color: Payment Type)"
+
+    # Pre-bin to a fixed 40x40 grid instead of shipping individual points;
+    # the payload is 1600 cells no matter how many trips are selected
+    counts, x_edges, y_edges = np.histogram2d(
+        df['trip_distance'].to_numpy(),
+        df['fare_amount'].to_numpy(),
+        bins=(40, 40)
     )
 
+    return DashboardVisualizations.create_distance_fare_density(
+        counts.T,
+        (x_edges[:-1] + x_edges[1:]) / 2,
+        (y_edges[:-1] + y_edges[1:]) / 2,
+        title="💰 Trip Economics: Distance vs Fare Density"
+    )
 
-@callback(
-    Output('borough-boxplot', 'figure'),
-    Input('filtered-data-store', 'data')
-)
+
+@cached_figure('borough-boxplot')
 def update_borough_boxplot(filtered_json):
     """Create borough-level fare distribution"""
-    
+
     df = load_filtered_data(filtered_json)
-    if df is None:
+    if df is None or len(df) == 0:
         return {}
-    
-    return DashboardVisualizations.create_borough_boxplot(
-        df,
+
+    # Reduce each borough to its five-number summary server-side; the box
+    # traces are drawn from precomputed stats, not from 50k raw values
+    fares = df['fare_amount'].to_numpy()
+    codes = df['pickup_borough'].cat.codes.to_numpy()
+    rows = []
+    for code, borough in enumerate(df['pickup_borough'].cat.categories):
+        vals = fares[codes == code]
+        if vals.size == 0:
+            continue
+        q1, median, q3 = np.percentile(vals, [25, 50, 75])
+        iqr = q3 - q1
+        rows.append({
+            'borough': borough,
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'lowerfence': max(vals.min(), q1 - 1.5 * iqr),
+            'upperfence': min(vals.max(), q3 + 1.5 * iqr)
+        })
+
+    return DashboardVisualizations.create_borough_boxplot_stats(
+        pd.DataFrame(rows),
         metric='fare_amount',
         title="🏙️ Fare Distribution by Borough"
     )
 
 
-@callback(
-    Output('payment-breakdown-chart', 'figure'),
-    Input('filtered-data-store', 'data')
-)
+@cached_figure('payment-breakdown-chart')
 def update_payment_breakdown(filtered_json):
     """Create payment type breakdown chart"""
-    
-    df = load_filtered_data(filtered_json)
-    if df is None:
+
+    if not filtered_json:
         return {}
-    
-    # Aggregate by payment type
-    payment_agg = df.groupby('payment_type_name').agg({
-        'PULocationID': 'count',
-        'fare_amount': 'mean',
-        'tip_amount': 'mean'
-    }).reset_index()
-    payment_agg.columns = ['payment_type', 'trip_count', 'avg_fare', 'avg_tip']
+    start_date, end_date, hour_range, payment_type, weather, day_type = \
+        json.loads(filtered_json)['filters']
+
+    # Slice the precomputed cube with the active filters — no raw-trip groupby
+    cube = _payment_cube
+    m = (cube['date'] >= pd.Timestamp(start_date)) & (cube['date'] <= pd.Timestamp(end_date))
+    m &= (cube['hour'] >= hour_range[0]) & (cube['hour'] <= hour_range[1])
+    if payment_type != 'all':
+        m &= cube['payment_type_name'] == payment_type
+    if weather != 'all':
+        m &= cube['is_rainy'] == weather
+    if day_type == 'weekday':
+        m &= ~cube['is_weekend']
+    elif day_type == 'weekend':
+        m &= cube['is_weekend']
+
+    sel = cube[m].groupby('payment_type_name', observed=True).agg(
+        trip_count=('trip_count', 'sum'),
+        fare_sum=('fare_sum', 'sum'),
+        tip_sum=('tip_sum', 'sum')
+    )
+    counts = sel['trip_count'].to_numpy()
+    payment_agg = pd.DataFrame({
+        'payment_type': sel.index,
+        'trip_count': counts,
+        'avg_fare': sel['fare_sum'].to_numpy() / np.maximum(counts, 1),
+        'avg_tip': sel['tip_sum'].to_numpy() / np.maximum(counts, 1)
+    })
     
     return DashboardVisualizations.create_payment_type_breakdown(
         payment_agg,
@@ -587,6 +784,31 @@ def update_payment_breakdown(filtered_json):
     )
 
 
+@callback(
+    [Output('time-series-chart', 'figure'),
+     Output('heatmap-hour-dow', 'figure'),
+     Output('weather-impact-chart', 'figure'),
+     Output('scatter-distance-fare', 'figure'),
+     Output('borough-boxplot', 'figure'),
+     Output('payment-breakdown-chart', 'figure')],
+    Input('filtered-data-store', 'data')
+)
+def update_all_charts(filtered_json):
+    """
+    Single fan-out callback for all six charts. One trigger means one
+    payload decode (load_filtered_data memoizes the gather) and one HTTP
+    round-trip; repeat payloads are served from the figure cache.
+    """
+    return (
+        update_time_series(filtered_json),
+        update_heatmap(filtered_json),
+        update_weather_chart(filtered_json),
+        update_scatter(filtered_json),
+        update_borough_boxplot(filtered_json),
+        update_payment_breakdown(filtered_json)
+    )
+
+
 # ============================================================
 # 6. RUN SERVER
 # ============================================================
@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration for production deployment.
+
+preload_app loads the dataset once in the master process before forking;
+on Linux the workers then share the loaded DataFrames copy-on-write, so
+memory is paid once instead of per worker and workers boot in milliseconds
+instead of each re-running load_all_data.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count(), 4)))
+preload_app = True
+timeout = 120
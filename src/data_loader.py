@@ -6,12 +6,19 @@ Handles NYC Taxi Data, Weather Data, and Geo Data Integration
 import pandas as pd
 import numpy as np
 import geopandas as gpd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import gzip
 import json
 from pathlib import Path
 import pickle
 import os
+import shutil
 
 class DataLoader:
     """Load and preprocess NYC Taxi + Weather data"""
@@ -55,7 +62,7 @@ class DataLoader:
             # Check if local file exists
             if local_file.exists():
                 print(f"📂 Loading from local cache: {local_file}")
-                df = pd.read_parquet(local_file, columns=columns)
+                df = self._read_parquet_filtered(local_file, columns, sample_size)
             else:
                 # Download with progress indicator
                 print(f"📥 Downloading from {url}...")
@@ -63,78 +70,156 @@ class DataLoader:
                 
                 response = requests.get(url, stream=True)
                 response.raise_for_status()
-                
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
-                chunk_size = 1024 * 1024  # 1MB chunks
-                
+
+                # copyfileobj moves 1MB blocks without per-chunk Python work
+                # or progress prints flushing to a possibly non-TTY stream
                 with open(local_file, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            if total_size > 0:
-                                pct = (downloaded / total_size) * 100
-                                print(f"\r   Progress: {pct:.1f}% ({downloaded/1024/1024:.1f}MB / {total_size/1024/1024:.1f}MB)", end='', flush=True)
-                
-                print(f"\n✓ Downloaded to: {local_file}")
-                df = pd.read_parquet(local_file, columns=columns)
-            
-            # Sample if data is too large
-            if len(df) > sample_size:
-                df = df.sample(n=sample_size, random_state=42)
-            
+                    shutil.copyfileobj(response.raw, f, length=1 << 20)
+
+                print(f"✓ Downloaded to: {local_file}")
+                df = self._read_parquet_filtered(local_file, columns, sample_size)
+
             # Data Cleaning
             df = self._clean_taxi_data(df)
-            
+
             print(f"✓ Loaded {len(df):,} taxi records")
             return df
-            
+
         except Exception as e:
             print(f"✗ Error loading taxi data: {e}")
             return pd.DataFrame()
-    
+
+    def _read_parquet_filtered(self, path, columns, sample_size):
+        """
+        Stream the parquet file batch by batch, applying the outlier
+        predicates inside Arrow so invalid rows are dropped before anything
+        is materialized to pandas. Only then is the (much smaller) result
+        sampled down to sample_size.
+        """
+        parquet_file = pq.ParquetFile(path)
+
+        batches = []
+        for batch in parquet_file.iter_batches(batch_size=65536, columns=columns):
+            keep = pc.and_(
+                pc.and_(pc.greater(batch['fare_amount'], 0),
+                        pc.less_equal(batch['fare_amount'], 300)),
+                pc.and_(
+                    pc.and_(pc.greater(batch['trip_distance'], 0),
+                            pc.less_equal(batch['trip_distance'], 100)),
+                    pc.and_(pc.greater(batch['passenger_count'], 0),
+                            pc.less_equal(batch['passenger_count'], 8))
+                )
+            )
+            batches.append(batch.filter(keep))
+
+        table = pa.Table.from_batches(batches)
+
+        # Sample on the Arrow table (columnar take) instead of a pandas frame
+        if table.num_rows > sample_size:
+            idx = np.random.default_rng(42).choice(table.num_rows, sample_size, replace=False)
+            table = table.take(np.sort(idx))
+
+        # TLC stores the location IDs as int64, which Arrow never
+        # dictionary-decodes at scan time; encode them explicitly so they
+        # reach pandas as categoricals (~265 distinct values) and the zone
+        # enrichment runs per category instead of per row
+        for name in ('PULocationID', 'DOLocationID'):
+            i = table.schema.get_field_index(name)
+            if i != -1:
+                table = table.set_column(i, name, pc.dictionary_encode(table[name]))
+
+        # split_blocks lets numeric columns be zero-copy views of the Arrow
+        # buffers; self_destruct releases those buffers as they are consumed,
+        # roughly halving peak memory during the conversion
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
     def _clean_taxi_data(self, df):
         """Clean and preprocess taxi data"""
         
         # Remove rows with invalid datetime
         df = df.dropna(subset=['tpep_pickup_datetime', 'tpep_dropoff_datetime'])
         
-        # Parse datetimes
-        df['tpep_pickup_datetime'] = pd.to_datetime(df['tpep_pickup_datetime'])
-        df['tpep_dropoff_datetime'] = pd.to_datetime(df['tpep_dropoff_datetime'])
-        
-        # Filter outliers
-        df = df[(df['fare_amount'] > 0) & (df['fare_amount'] <= 300)]
-        df = df[(df['trip_distance'] > 0) & (df['trip_distance'] <= 100)]
-        df = df[(df['passenger_count'] > 0) & (df['passenger_count'] <= 8)]
-        
-        # Create temporal features
-        df['date'] = df['tpep_pickup_datetime'].dt.date
-        df['hour'] = df['tpep_pickup_datetime'].dt.hour
-        df['day_of_week'] = df['tpep_pickup_datetime'].dt.day_name()
-        df['month'] = df['tpep_pickup_datetime'].dt.month
-        df['trip_duration_minutes'] = (
-            (df['tpep_dropoff_datetime'] - df['tpep_pickup_datetime']).dt.total_seconds() / 60
-        ).round(2)
+        # TLC parquet stores native timestamps, so Arrow already delivers
+        # datetime64 columns; only parse if another source handed us strings
+        for col in ('tpep_pickup_datetime', 'tpep_dropoff_datetime'):
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col])
+        
+        # Compute durations up front so all outlier bounds can fuse below:
+        # int64 nanosecond subtraction plus one float32 scale, instead of a
+        # timedelta array -> float64 seconds -> divide -> round pipeline
+        dur_ns = (
+            df['tpep_dropoff_datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+            - df['tpep_pickup_datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        )
+        dur = (dur_ns * (1.0 / 60e9)).astype('float32')
+
+        # Filter outliers with one fused mask and a single copy, instead of
+        # chained df[cond] slices that each copy the whole frame
+        fare = df['fare_amount'].to_numpy()
+        dist = df['trip_distance'].to_numpy()
+        pax = df['passenger_count'].to_numpy()
+        mask = (
+            (fare > 0) & (fare <= 300)
+            & (dist > 0) & (dist <= 100)
+            & (pax > 0) & (pax <= 8)
+            & (dur > 0) & (dur <= 480)
+        )
+        df = df.loc[mask].copy()
+        df['trip_duration_minutes'] = dur[mask]
+
+        # Downcast to narrow dtypes: halves the memory traffic of every
+        # downstream groupby. The ID/payment columns arrive categorical from
+        # the parquet dictionary decode, in which case they stay as-is.
+        narrow_dtypes = (
+            ('fare_amount', 'float32'), ('trip_distance', 'float32'),
+            ('tip_amount', 'float32'), ('tolls_amount', 'float32'),
+            ('total_amount', 'float32'), ('extra', 'float32'),
+            ('mta_tax', 'float32'),
+            ('passenger_count', 'int8'), ('payment_type', 'int8'),
+            ('PULocationID', 'int16'), ('DOLocationID', 'int16'),
+        )
+        for col, dtype in narrow_dtypes:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(dtype)
+
+        # Create temporal features with integer arithmetic on one int64 view
+        # of the pickup timestamps, instead of a .dt traversal per column
+        ns = df['tpep_pickup_datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        days = ns // 86_400_000_000_000
+        # datetime64-backed date instead of boxed datetime.date objects, so
+        # groupbys and merges on it hash int64s rather than Python objects
+        df['date'] = days.astype('datetime64[D]')
+        df['hour'] = ((ns // 3_600_000_000_000) % 24).astype('int8')
+        # Day names as an ordered Categorical over the weekday codes
+        # (epoch day 0 was a Thursday), so groupbys hash int8 codes and
+        # sorting follows calendar order without dt.day_name()'s strftime
+        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday',
+                     'Friday', 'Saturday', 'Sunday']
+        dow = ((days + 3) % 7).astype('int8')
+        df['day_of_week'] = pd.Categorical.from_codes(
+            dow, categories=day_names, ordered=True
+        )
+        months = days.astype('datetime64[D]').astype('datetime64[M]').view(np.int64)
+        df['month'] = (months % 12 + 1).astype('int8')
         
         # Fare metrics
-        df['tip_percentage'] = (df['tip_amount'] / df['fare_amount'] * 100).round(2)
-        df['price_per_mile'] = (df['fare_amount'] / df['trip_distance']).round(2)
-        
-        # Payment type mapping
-        payment_map = {
-            1: 'Credit Card',
-            2: 'Cash',
-            3: 'No Charge',
-            4: 'Dispute',
-            5: 'Unknown'
-        }
-        df['payment_type_name'] = df['payment_type'].map(payment_map).fillna('Unknown')
-        
-        # Remove invalid trip duration
-        df = df[(df['trip_duration_minutes'] > 0) & (df['trip_duration_minutes'] <= 480)]
-        
+        # No rounding: these only feed aggregations, and the displays format
+        # their own decimals, so .round(2) was a wasted pass per column
+        df['tip_percentage'] = df['tip_amount'] / df['fare_amount'] * 100
+        df['price_per_mile'] = df['fare_amount'] / df['trip_distance']
+        
+        # Payment type mapping, built straight from the int codes as a
+        # Categorical — no per-row dict lookups, and downstream groupbys hash
+        # the int8 codes instead of strings. Codes outside 1-4 (5, voided
+        # trips, nulls) all collapse onto 'Unknown'.
+        payment_names = ['Credit Card', 'Cash', 'No Charge', 'Dispute', 'Unknown']
+        codes = np.asarray(df['payment_type'], dtype='int64') - 1
+        np.putmask(codes, (codes < 0) | (codes >= 4), 4)
+        df['payment_type_name'] = pd.Categorical.from_codes(
+            codes.astype('int8'), categories=payment_names
+        )
+
         return df
     
     def load_nyc_zones_geojson(self):
@@ -182,23 +267,41 @@ class DataLoader:
     
     def enrich_taxi_data_with_zones(self, df, zone_lookup):
         """Add zone names and boroughs to taxi data"""
-        
-        # Map pickup zone
-        df['pickup_zone'] = df['PULocationID'].map(
-            lambda x: zone_lookup.get(x, {}).get('zone_name', 'Unknown')
-        )
-        df['pickup_borough'] = df['PULocationID'].map(
-            lambda x: zone_lookup.get(x, {}).get('borough', 'Unknown')
-        )
-        
-        # Map dropoff zone
-        df['dropoff_zone'] = df['DOLocationID'].map(
-            lambda x: zone_lookup.get(x, {}).get('zone_name', 'Unknown')
-        )
-        df['dropoff_borough'] = df['DOLocationID'].map(
-            lambda x: zone_lookup.get(x, {}).get('borough', 'Unknown')
-        )
-        
+
+        for id_col, zone_col, borough_col in (
+            ('PULocationID', 'pickup_zone', 'pickup_borough'),
+            ('DOLocationID', 'dropoff_zone', 'dropoff_borough')
+        ):
+            ids = df[id_col]
+            if isinstance(ids.dtype, pd.CategoricalDtype):
+                # Dictionary-encoded IDs: one lookup per distinct zone
+                # (~265), then a vectorized gather over the int codes
+                cats = ids.cat.categories
+                names = np.array(
+                    [zone_lookup.get(i, {}).get('zone_name', 'Unknown') for i in cats],
+                    dtype=object
+                )
+                boroughs = np.array(
+                    [zone_lookup.get(i, {}).get('borough', 'Unknown') for i in cats],
+                    dtype=object
+                )
+                codes = ids.cat.codes.to_numpy()
+                df[zone_col] = pd.Categorical(names[codes])
+                df[borough_col] = pd.Categorical(boroughs[codes])
+            else:
+                # Plain integer IDs: dense lookup tables indexed by zone ID,
+                # filled once (~265 entries), then a single fancy-index gather
+                max_id = max(zone_lookup, default=0)
+                names = np.full(max_id + 2, 'Unknown', dtype=object)
+                boroughs = np.full(max_id + 2, 'Unknown', dtype=object)
+                for zone_id, info in zone_lookup.items():
+                    names[zone_id] = info.get('zone_name', 'Unknown')
+                    boroughs[zone_id] = info.get('borough', 'Unknown')
+                # Out-of-range IDs land on the trailing 'Unknown' slot
+                idx = np.clip(ids.to_numpy(), 0, max_id + 1)
+                df[zone_col] = names[idx]
+                df[borough_col] = boroughs[idx]
+
         return df
     
     def generate_synthetic_weather(self, df):
@@ -210,45 +313,38 @@ class DataLoader:
             pd.DataFrame: Weather data with temperature, precipitation flags
         """
         print("Generating synthetic weather patterns...")
-        
+
         # Get unique dates
-        dates = pd.to_datetime(df['date'].unique())
-        
-        weather_data = []
-        for date in dates:
-            # Simulate seasonal temperature patterns
-            day_of_year = date.dayofyear
-            base_temp = 35 + 30 * np.sin(2 * np.pi * day_of_year / 365)
-            temp = base_temp + np.random.normal(0, 5)
-            
-            # Simulate precipitation (15% chance per day)
-            is_rainy = np.random.random() < 0.15
-            precipitation = np.random.exponential(0.3) if is_rainy else 0
-            
-            weather_data.append({
-                'date': date.date(),
-                'temperature': round(temp, 1),
-                'is_rainy': is_rainy,
-                'precipitation_inches': round(precipitation, 2)
-            })
-        
-        weather_df = pd.DataFrame(weather_data)
+        dates = pd.DatetimeIndex(df['date'].unique())
+
+        # One vectorized draw per column instead of a per-date Python loop
+        rng = np.random.default_rng(42)
+        day_of_year = dates.dayofyear.to_numpy()
+        base_temp = 35 + 30 * np.sin(2 * np.pi * day_of_year / 365)
+        temp = base_temp + rng.normal(0, 5, size=day_of_year.size)
+
+        # Simulate precipitation (15% chance per day)
+        is_rainy = rng.random(day_of_year.size) < 0.15
+        precipitation = np.where(
+            is_rainy, rng.exponential(0.3, size=day_of_year.size), 0.0
+        )
+
+        weather_df = pd.DataFrame({
+            'date': dates.to_numpy().astype('datetime64[D]'),
+            'temperature': temp.round(1),
+            'is_rainy': is_rainy,
+            'precipitation_inches': precipitation.round(2)
+        })
         print(f"✓ Generated weather data for {len(weather_df)} days")
         return weather_df
     
     def merge_weather_data(self, taxi_df, weather_df):
-        """Merge weather data with taxi data"""
-        taxi_df['date_for_merge'] = pd.to_datetime(taxi_df['date'])
-        weather_df['date_for_merge'] = pd.to_datetime(weather_df['date'])
-        
-        merged = taxi_df.merge(
-            weather_df[['date_for_merge', 'temperature', 'is_rainy', 'precipitation_inches']],
-            on='date_for_merge',
+        """Merge weather data with taxi data on the datetime64 date column"""
+        return taxi_df.merge(
+            weather_df[['date', 'temperature', 'is_rainy', 'precipitation_inches']],
+            on='date',
             how='left'
         )
-        
-        merged = merged.drop('date_for_merge', axis=1)
-        return merged
     
     def create_aggregations(self, df):
         """
@@ -258,75 +354,168 @@ class DataLoader:
             dict: Multiple aggregated DataFrames
         """
         print("Creating aggregated datasets...")
-        
+
         agg_dict = {}
-        
+
+        # Lowest-grain cube: one groupby pass over the raw rows, keeping
+        # per-group sums and counts. Every rollup below re-groups the cube
+        # (a few thousand rows), so the frame itself is scanned once instead
+        # of once per aggregation; means are recovered as sum/count.
+        # observed=True keeps categorical keys to combinations that actually
+        # occur, sort=False skips the post-group sort, and as_index=False
+        # returns flat columns without the MultiIndex/reset_index round-trip
+        cube = df.groupby(
+            ['date', 'hour', 'day_of_week', 'pickup_borough', 'payment_type_name'],
+            observed=True, sort=False, as_index=False
+        ).agg(
+            trip_count=('fare_amount', 'size'),
+            fare_sum=('fare_amount', 'sum'),
+            distance_sum=('trip_distance', 'sum'),
+            duration_sum=('trip_duration_minutes', 'sum'),
+            tip_pct_sum=('tip_percentage', 'sum'),
+            passenger_sum=('passenger_count', 'sum'),
+            rainy_sum=('is_rainy', 'sum')
+        )
+
+        def _rollup(keys):
+            return cube.groupby(keys, observed=True, sort=False, as_index=False).agg(
+                trip_count=('trip_count', 'sum'),
+                fare_sum=('fare_sum', 'sum'),
+                distance_sum=('distance_sum', 'sum'),
+                duration_sum=('duration_sum', 'sum'),
+                tip_pct_sum=('tip_pct_sum', 'sum'),
+                passenger_sum=('passenger_sum', 'sum'),
+                rainy_sum=('rainy_sum', 'sum')
+            )
+
         # 1. Daily aggregation
-        agg_dict['daily'] = df.groupby('date').agg({
-            'fare_amount': ['sum', 'mean'],
-            'trip_distance': 'mean',
-            'trip_duration_minutes': 'mean',
-            'tip_percentage': 'mean',
-            'passenger_count': 'mean',
-            'PULocationID': 'count'  # Trip count
-        }).reset_index()
-        agg_dict['daily'].columns = [
-            'date', 'total_fare', 'avg_fare', 'avg_distance',
-            'avg_duration', 'avg_tip_pct', 'avg_passengers', 'trip_count'
-        ]
-        
+        daily = _rollup('date')
+        agg_dict['daily'] = pd.DataFrame({
+            'date': daily['date'],
+            'total_fare': daily['fare_sum'],
+            'avg_fare': daily['fare_sum'] / daily['trip_count'],
+            'avg_distance': daily['distance_sum'] / daily['trip_count'],
+            'avg_duration': daily['duration_sum'] / daily['trip_count'],
+            'avg_tip_pct': daily['tip_pct_sum'] / daily['trip_count'],
+            'avg_passengers': daily['passenger_sum'] / daily['trip_count'],
+            'trip_count': daily['trip_count']
+        })
+
         # 2. Hourly aggregation
-        df['date_hour'] = df['tpep_pickup_datetime'].dt.floor('h')
-        agg_dict['hourly'] = df.groupby('date_hour').agg({
-            'fare_amount': ['sum', 'mean'],
-            'PULocationID': 'count'
-        }).reset_index()
-        agg_dict['hourly'].columns = ['date_hour', 'total_fare', 'avg_fare', 'trip_count']
-        
+        hourly = _rollup(['date', 'hour'])
+        agg_dict['hourly'] = pd.DataFrame({
+            'date_hour': pd.to_datetime(hourly['date'])
+            + pd.to_timedelta(hourly['hour'], unit='h'),
+            'total_fare': hourly['fare_sum'],
+            'avg_fare': hourly['fare_sum'] / hourly['trip_count'],
+            'trip_count': hourly['trip_count']
+        })
+
         # 3. Hour × Day of Week aggregation
-        agg_dict['hour_dow'] = df.groupby(['hour', 'day_of_week']).agg({
-            'PULocationID': 'count',
-            'fare_amount': 'mean'
-        }).reset_index()
-        agg_dict['hour_dow'].columns = ['hour', 'day_of_week', 'trip_count', 'avg_fare']
-        
+        hour_dow = _rollup(['hour', 'day_of_week'])
+        agg_dict['hour_dow'] = pd.DataFrame({
+            'hour': hour_dow['hour'],
+            'day_of_week': hour_dow['day_of_week'],
+            'trip_count': hour_dow['trip_count'],
+            'avg_fare': hour_dow['fare_sum'] / hour_dow['trip_count']
+        })
+
         # 4. Borough aggregation
-        agg_dict['borough'] = df.groupby('pickup_borough').agg({
-            'fare_amount': ['sum', 'mean'],
-            'trip_distance': 'mean',
-            'PULocationID': 'count',
-            'is_rainy': 'mean'
-        }).reset_index()
-        agg_dict['borough'].columns = [
-            'borough', 'total_fare', 'avg_fare', 'avg_distance',
-            'trip_count', 'rainy_proportion'
-        ]
-        
+        borough = _rollup('pickup_borough')
+        agg_dict['borough'] = pd.DataFrame({
+            'borough': borough['pickup_borough'],
+            'total_fare': borough['fare_sum'],
+            'avg_fare': borough['fare_sum'] / borough['trip_count'],
+            'avg_distance': borough['distance_sum'] / borough['trip_count'],
+            'trip_count': borough['trip_count'],
+            'rainy_proportion': borough['rainy_sum'] / borough['trip_count']
+        })
+
         # 5. Payment type aggregation
-        agg_dict['payment'] = df.groupby('payment_type_name').agg({
-            'fare_amount': ['sum', 'mean'],
-            'tip_percentage': 'mean',
-            'PULocationID': 'count'
-        }).reset_index()
-        agg_dict['payment'].columns = [
-            'payment_type', 'total_fare', 'avg_fare', 'avg_tip_pct', 'trip_count'
-        ]
-        
+        payment = _rollup('payment_type_name')
+        agg_dict['payment'] = pd.DataFrame({
+            'payment_type': payment['payment_type_name'],
+            'total_fare': payment['fare_sum'],
+            'avg_fare': payment['fare_sum'] / payment['trip_count'],
+            'avg_tip_pct': payment['tip_pct_sum'] / payment['trip_count'],
+            'trip_count': payment['trip_count']
+        })
+
         print(f"✓ Created {len(agg_dict)} aggregated datasets")
         return agg_dict
 
 
+def _write_feather_cache(data, feather_dir):
+    """Cache the data dict as Feather v2 (LZ4) files plus a JSON sidecar"""
+    feather_dir.mkdir(parents=True, exist_ok=True)
+    data['raw'].to_feather(feather_dir / 'taxi.feather', compression='lz4')
+    for name, agg in data['aggregations'].items():
+        agg.to_feather(feather_dir / f'agg_{name}.feather', compression='lz4')
+    if data['geojson'] is not None:
+        # The geometry JSON is highly redundant text; gzip shrinks it ~5x
+        with gzip.open(feather_dir / 'geojson.json.gz', 'wt', compresslevel=6) as f:
+            json.dump(data['geojson'], f)
+    with open(feather_dir / 'meta.json', 'w') as f:
+        json.dump({
+            'zone_lookup': {str(k): v for k, v in data['zone_lookup'].items()},
+            'aggregations': list(data['aggregations'])
+        }, f)
+
+
+def _read_feather_cache(feather_dir):
+    """Load the cached data dict written by _write_feather_cache"""
+    with open(feather_dir / 'meta.json') as f:
+        meta = json.load(f)
+    # JSON stringifies the integer zone IDs; restore them on the way in
+    zone_lookup = {
+        (int(k) if k.lstrip('-').isdigit() else k): v
+        for k, v in meta['zone_lookup'].items()
+    }
+    geojson = None
+    if (feather_dir / 'geojson.json.gz').exists():
+        with gzip.open(feather_dir / 'geojson.json.gz', 'rt') as f:
+            geojson = json.load(f)
+    elif (feather_dir / 'geojson.json').exists():
+        # Caches written before the sidecar was compressed
+        with open(feather_dir / 'geojson.json') as f:
+            geojson = json.load(f)
+    return {
+        'raw': feather.read_feather(feather_dir / 'taxi.feather', memory_map=True),
+        'geojson': geojson,
+        'zone_lookup': zone_lookup,
+        'aggregations': {
+            name: feather.read_feather(feather_dir / f'agg_{name}.feather', memory_map=True)
+            for name in meta['aggregations']
+        }
+    }
+
+
 def load_all_data(year=2023, month=1, sample_size=50000, use_cache=True):
     """Main function to load and prepare all data with caching support"""
-    
+
     # Define cache file path
     cache_dir = Path('data/cache')
     cache_dir.mkdir(parents=True, exist_ok=True)
-    cache_file = cache_dir / f'taxi_data_{year}_{month:02d}_{sample_size}.pkl'
-    
-    # Try to load from cache if enabled
-    if use_cache and cache_file.exists():
+    cache_key = f'taxi_data_{year}_{month:02d}_{sample_size}'
+    feather_dir = cache_dir / cache_key
+    cache_file = cache_dir / f'{cache_key}.pkl'
+
+    # Try to load from cache if enabled. Feather v2 deserializes the frames
+    # near zero-copy from memory-mapped files; the pickle branch only remains
+    # to read caches written by older versions.
+    if use_cache and (feather_dir / 'meta.json').exists():
         print("📦 Loading data from cache...")
+        try:
+            data = _read_feather_cache(feather_dir)
+            print("✓ Data loaded from cache successfully!")
+            print(f"  - Raw records: {len(data['raw']):,}")
+            print(f"  - Date range: {data['raw']['date'].min()} to {data['raw']['date'].max()}")
+            print(f"  - Zones covered: {data['raw']['pickup_borough'].nunique()}")
+            return data
+        except Exception as e:
+            print(f"⚠ Cache load failed: {e}. Downloading fresh data...")
+    elif use_cache and cache_file.exists():
+        print("📦 Loading data from legacy pickle cache...")
         try:
             with open(cache_file, 'rb') as f:
                 data = pickle.load(f)
@@ -338,25 +527,27 @@ def load_all_data(year=2023, month=1, sample_size=50000, use_cache=True):
         except Exception as e:
             print(f"⚠ Cache load failed: {e}. Downloading fresh data...")
     
-    # Download and process data
+    # Download and process data. The GeoJSON fetch is network-bound and the
+    # parquet decode runs in Arrow C++ outside the GIL, so the two overlap
+    # cleanly on a thread; the same holds for weather generation (reads only
+    # the date column) against the zone enrichment (writes new columns).
     loader = DataLoader()
-    
-    # Load taxi data
-    taxi_df = loader.load_taxi_data(year=year, month=month, sample_size=sample_size)
-    
-    if taxi_df.empty:
-        print("✗ Failed to load taxi data")
-        return None
-    
-    # Load zones
-    geojson = loader.load_nyc_zones_geojson()
-    zone_lookup = loader.create_zone_lookup(geojson)
-    
-    # Enrich taxi data
-    taxi_df = loader.enrich_taxi_data_with_zones(taxi_df, zone_lookup)
-    
-    # Add weather
-    weather_df = loader.generate_synthetic_weather(taxi_df)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        geojson_future = pool.submit(loader.load_nyc_zones_geojson)
+        taxi_df = loader.load_taxi_data(year=year, month=month, sample_size=sample_size)
+
+        if taxi_df.empty:
+            print("✗ Failed to load taxi data")
+            return None
+
+        geojson = geojson_future.result()
+        zone_lookup = loader.create_zone_lookup(geojson)
+
+        weather_future = pool.submit(loader.generate_synthetic_weather, taxi_df)
+        taxi_df = loader.enrich_taxi_data_with_zones(taxi_df, zone_lookup)
+        weather_df = weather_future.result()
+
     taxi_df = loader.merge_weather_data(taxi_df, weather_df)
     
     # Create aggregations
@@ -377,9 +568,8 @@ def load_all_data(year=2023, month=1, sample_size=50000, use_cache=True):
     # Save to cache
     try:
         print("💾 Saving data to cache...")
-        with open(cache_file, 'wb') as f:
-            pickle.dump(data, f)
-        print(f"✓ Data cached to: {cache_file}")
+        _write_feather_cache(data, feather_dir)
+        print(f"✓ Data cached to: {feather_dir}")
     except Exception as e:
         print(f"⚠ Failed to save cache: {e}")
     
@@ -10,6 +10,35 @@ import pandas as pd
 import numpy as np
 
 
+def centered_moving_average(values, window=7):
+    """
+    Centered moving average via a single convolution, with the divisor
+    shrunk at the edges where the window is truncated. Equivalent to
+    rolling(window, center=True, min_periods=1).mean() without the
+    per-call Rolling object setup.
+    """
+    x = np.asarray(values, dtype='float64')
+    if x.size == 0:
+        return x
+    # Slice the full convolution rather than using mode='same': 'same'
+    # returns max(x.size, window) elements, so short selections (fewer
+    # days than the window) would come back the wrong length
+    kernel = np.ones(window)
+    start = window // 2
+    sums = np.convolve(x, kernel)[start:start + x.size]
+    counts = np.convolve(np.ones_like(x), kernel)[start:start + x.size]
+    return sums / counts
+
+
+# Layout fragments shared by the chart factories, built once at import so
+# every figure reuses the same subtrees instead of re-allocating identical
+# dict literals on each callback
+_TITLE_FONT = dict(size=18, color='#343a40')
+_WHITE_BG = dict(plot_bgcolor='#ffffff', paper_bgcolor='#ffffff')
+_CHART_MARGIN = dict(l=60, r=20, t=60, b=60)
+_SUBPLOT_MARGIN = dict(l=60, r=20, t=80, b=60)
+
+
 class DashboardVisualizations:
     """Create linked, interactive visualizations"""
     
@@ -58,7 +87,7 @@ class DashboardVisualizations:
         ))
         
         # Add moving average
-        moving_avg = daily_data['trip_count'].rolling(window=7, center=True).mean()
+        moving_avg = centered_moving_average(daily_data['trip_count'].to_numpy())
         fig.add_trace(go.Scatter(
             x=pd.to_datetime(daily_data['date']),
             y=moving_avg,
@@ -69,7 +98,7 @@ class DashboardVisualizations:
         ))
         
         fig.update_layout(
-            title=dict(text=title, font=dict(size=18, color='#343a40')),
+            title=dict(text=title, font=_TITLE_FONT),
             xaxis=dict(
                 title='Date',
                 rangeselector=dict(
@@ -86,10 +115,9 @@ class DashboardVisualizations:
             ),
             yaxis=dict(title='Number of Trips', gridcolor='#e9ecef'),
             hovermode='x unified',
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
             height=400,
-            margin=dict(l=60, r=20, t=60, b=60)
+            margin=_CHART_MARGIN,
+            **_WHITE_BG
         )
         
         return fig
@@ -131,13 +159,12 @@ class DashboardVisualizations:
         ))
         
         fig.update_layout(
-            title=dict(text=title, font=dict(size=18, color='#343a40')),
+            title=dict(text=title, font=_TITLE_FONT),
             xaxis=dict(title='Hour of Day'),
             yaxis=dict(title='Day of Week'),
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
             height=350,
-            margin=dict(l=100, r=20, t=60, b=60)
+            margin=dict(l=100, r=20, t=60, b=60),
+            **_WHITE_BG
         )
         
         return fig
@@ -146,55 +173,121 @@ class DashboardVisualizations:
     def create_scatter_distance_fare(taxi_data, title="Trip Distance vs Fare Amount"):
         """
         Create scatter plot showing distance-fare relationship.
-        Color by payment type, size by passenger count.
-        
+        Trips are pre-binned on a 200x200 grid per payment type and drawn
+        as one WebGL Scattergl trace each, so the browser receives a few
+        thousand count-weighted cells instead of every raw row.
+
         Args:
             taxi_data (pd.DataFrame): Raw taxi data
             title (str): Chart title
-        
+
         Returns:
             go.Figure: Plotly scatter
         """
-        fig = px.scatter(
-            taxi_data,
-            x='trip_distance',
-            y='fare_amount',
-            color='payment_type_name',
-            size='passenger_count',
-            hover_data=['trip_duration_minutes', 'tip_percentage'],
+        color_map = {
+            'Credit Card': '#1f77b4',
+            'Cash': '#ff7f0e',
+            'No Charge': '#2ca02c',
+            'Dispute': '#d62728',
+            'Unknown': '#d3d3d3'
+        }
+
+        dist = taxi_data['trip_distance'].to_numpy(dtype='float64')
+        fare = taxi_data['fare_amount'].to_numpy(dtype='float64')
+        payment = taxi_data['payment_type_name']
+
+        binned = []
+        if len(taxi_data) > 0:
+            x_edges = np.linspace(0, dist.max(), 201)
+            y_edges = np.linspace(0, fare.max(), 201)
+            for name in payment.unique():
+                in_group = (payment == name).to_numpy()
+                counts, _, _ = np.histogram2d(
+                    dist[in_group], fare[in_group], bins=(x_edges, y_edges)
+                )
+                xi, yi = np.nonzero(counts)
+                binned.append((str(name), xi, yi, counts[xi, yi]))
+
+        # Shared area scale so marker sizes compare across payment types
+        max_count = max((cell.max() for _, _, _, cell in binned), default=1)
+        sizeref = 2.0 * np.sqrt(max_count) / (12.0 ** 2)
+
+        fig = go.Figure()
+        for name, xi, yi, cell_counts in binned:
+            fig.add_trace(go.Scattergl(
+                x=(x_edges[xi] + x_edges[xi + 1]) / 2,
+                y=(y_edges[yi] + y_edges[yi + 1]) / 2,
+                mode='markers',
+                name=name,
+                marker=dict(
+                    color=color_map.get(name, '#d3d3d3'),
+                    size=np.sqrt(cell_counts),
+                    sizemode='area',
+                    sizeref=sizeref,
+                    sizemin=2,
+                    opacity=0.6
+                ),
+                customdata=cell_counts,
+                hovertemplate='<b>Distance:</b> %{x:.2f} mi<br>' +
+                             '<b>Fare:</b> $%{y:.2f}<br>' +
+                             '<b>Trips:</b> %{customdata:,.0f}<br>' +
+                             '<extra></extra>'
+            ))
+
+        fig.update_layout(
             title=title,
-            labels={
-                'trip_distance': 'Distance (miles)',
-                'fare_amount': 'Fare ($)',
-                'payment_type_name': 'Payment Type',
-                'passenger_count': 'Passengers'
-            },
-            color_discrete_map={
-                'Credit Card': '#1f77b4',
-                'Cash': '#ff7f0e',
-                'Unknown': '#d3d3d3'
-            }
-        )
-        
-        fig.update_traces(
-            marker=dict(opacity=0.6, line=dict(width=0.5)),
-            hovertemplate='<b>Distance:</b> %{x:.2f} mi<br>' +
-                         '<b>Fare:</b> $%{y:.2f}<br>' +
-                         '<b>Duration:</b> %{customdata[0]:.0f} min<br>' +
-                         '<b>Tip %:</b> %{customdata[1]:.1f}%<br>' +
-                         '<extra></extra>'
+            xaxis_title='Distance (miles)',
+            yaxis_title='Fare ($)',
+            legend_title_text='Payment Type',
+            height=400,
+            margin=_CHART_MARGIN,
+            font=dict(family='Arial, sans-serif', size=11),
+            **_WHITE_BG
         )
-        
+
+        return fig
+    
+    @staticmethod
+    def create_distance_fare_density(counts, x_centers, y_centers,
+                                     title="Trip Distance vs Fare Density"):
+        """
+        Create 2-D density heatmap of distance vs fare from pre-binned counts.
+        Fixed cell count regardless of how many trips are selected, so the
+        payload stays small even on the full dataset.
+
+        Args:
+            counts (np.ndarray): 2-D histogram counts, shape (n_fare_bins, n_dist_bins)
+            x_centers (np.ndarray): Distance bin centers
+            y_centers (np.ndarray): Fare bin centers
+            title (str): Chart title
+
+        Returns:
+            go.Figure: Plotly heatmap
+        """
+        fig = go.Figure(data=go.Heatmap(
+            z=np.log1p(counts),
+            x=x_centers,
+            y=y_centers,
+            customdata=counts,
+            colorscale='Blues',
+            hovertemplate='<b>Distance:</b> %{x:.1f} mi<br>' +
+                         '<b>Fare:</b> $%{y:.1f}<br>' +
+                         '<b>Trips:</b> %{customdata:,.0f}<br>' +
+                         '<extra></extra>',
+            colorbar=dict(title='log(1+Trips)')
+        ))
+
         fig.update_layout(
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
+            title=dict(text=title, font=_TITLE_FONT),
+            xaxis=dict(title='Distance (miles)'),
+            yaxis=dict(title='Fare ($)'),
             height=400,
-            margin=dict(l=60, r=20, t=60, b=60),
-            font=dict(family='Arial, sans-serif', size=11)
+            margin=_CHART_MARGIN,
+            **_WHITE_BG
         )
-        
+
         return fig
-    
+
     @staticmethod
     def create_borough_boxplot(taxi_data, metric='fare_amount', title="Fare Distribution by Borough"):
         """
@@ -221,15 +314,56 @@ class DashboardVisualizations:
         )
         
         fig.update_layout(
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
             height=350,
             showlegend=False,
-            margin=dict(l=60, r=20, t=60, b=60)
+            margin=_CHART_MARGIN,
+            **_WHITE_BG
         )
-        
+
         return fig
-    
+
+    @staticmethod
+    def create_borough_boxplot_stats(borough_stats, metric='fare_amount',
+                                     title="Fare Distribution by Borough"):
+        """
+        Create box plot from precomputed per-borough quantile stats.
+        Plotly renders the boxes directly from the five-number summary, so
+        no raw values are sorted or shipped to the browser.
+
+        Args:
+            borough_stats (pd.DataFrame): One row per borough with 'borough',
+                'q1', 'median', 'q3', 'lowerfence', 'upperfence' columns
+            metric (str): Metric the stats describe (used for the axis label)
+            title (str): Chart title
+
+        Returns:
+            go.Figure: Plotly box plot
+        """
+        fig = go.Figure()
+
+        for _, row in borough_stats.iterrows():
+            fig.add_trace(go.Box(
+                x=[row['borough']],
+                q1=[row['q1']],
+                median=[row['median']],
+                q3=[row['q3']],
+                lowerfence=[row['lowerfence']],
+                upperfence=[row['upperfence']],
+                name=str(row['borough'])
+            ))
+
+        fig.update_layout(
+            title=dict(text=title, font=_TITLE_FONT),
+            xaxis=dict(title='Borough'),
+            yaxis=dict(title=metric.replace('_', ' ').title()),
+            height=350,
+            showlegend=False,
+            margin=_CHART_MARGIN,
+            **_WHITE_BG
+        )
+
+        return fig
+
     @staticmethod
     def create_choropleth_map(borough_agg_data, geojson, title="Pickup Volume by Borough"):
         """
@@ -260,7 +394,7 @@ class DashboardVisualizations:
         )
         
         fig.update_layout(
-            title=dict(text=title, font=dict(size=18, color='#343a40')),
+            title=dict(text=title, font=_TITLE_FONT),
             height=400,
             margin=dict(l=0, r=0, t=60, b=0)
         )
@@ -318,49 +452,38 @@ class DashboardVisualizations:
             title_text=title,
             height=350,
             showlegend=False,
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
-            margin=dict(l=60, r=20, t=80, b=60)
+            margin=_SUBPLOT_MARGIN,
+            **_WHITE_BG
         )
         
         return fig
     
     @staticmethod
-    def create_weather_impact_chart(taxi_data, title="Trip Volume: Rainy vs Clear Days"):
+    def create_weather_impact_chart(weather_stats, title="Trip Volume: Rainy vs Clear Days"):
         """
         Compare trip metrics between rainy and clear days.
-        
+
         Args:
-            taxi_data (pd.DataFrame): Raw taxi data with 'is_rainy' column
+            weather_stats (pd.DataFrame): Pre-aggregated stats with 'weather',
+                'trip_count', 'avg_fare', 'avg_distance' columns
             title (str): Chart title
-        
+
         Returns:
             go.Figure: Plotly bar chart
         """
-        weather_comparison = taxi_data.groupby('is_rainy').agg({
-            'PULocationID': 'count',
-            'fare_amount': 'mean',
-            'trip_distance': 'mean'
-        }).reset_index()
-        
-        weather_comparison['weather'] = weather_comparison['is_rainy'].map({
-            True: '🌧️ Rainy',
-            False: '☀️ Clear'
-        })
-        
         fig = make_subplots(
             rows=1, cols=3,
             subplot_titles=('Trip Count', 'Avg Fare ($)', 'Avg Distance (mi)'),
             specs=[[{'type': 'bar'}, {'type': 'bar'}, {'type': 'bar'}]]
         )
-        
+
         colors = ['#1f77b4', '#ff7f0e']
-        
-        for i, metric in enumerate(['PULocationID', 'fare_amount', 'trip_distance']):
+
+        for i, metric in enumerate(['trip_count', 'avg_fare', 'avg_distance']):
             fig.add_trace(
                 go.Bar(
-                    x=weather_comparison['weather'],
-                    y=weather_comparison[metric],
+                    x=weather_stats['weather'],
+                    y=weather_stats[metric],
                     marker=dict(color=colors),
                     hovertemplate='<b>%{x}</b><br>Value: %{y:.0f}<extra></extra>',
                     showlegend=False
@@ -371,9 +494,8 @@ class DashboardVisualizations:
         fig.update_layout(
             title_text=title,
             height=350,
-            plot_bgcolor='#ffffff',
-            paper_bgcolor='#ffffff',
-            margin=dict(l=60, r=20, t=80, b=60)
+            margin=_SUBPLOT_MARGIN,
+            **_WHITE_BG
         )
         
         return fig
@@ -386,15 +508,30 @@ def create_summary_metrics(taxi_data, agg_data):
     Returns:
         dict: Summary metrics
     """
+    n = len(taxi_data)
+    if n == 0:
+        return {
+            'total_trips': 0, 'avg_fare': 0.0, 'avg_distance': 0.0,
+            'avg_duration': 0.0, 'total_revenue': 0.0, 'date_range': 'N/A',
+            'peak_hour': 0, 'busiest_borough': 'Unknown'
+        }
+
+    # Reduce over the raw NumPy arrays: the fare column is scanned once for
+    # sum (mean is sum/n), and the 24-bucket bincount replaces mode()
+    fare = taxi_data['fare_amount'].to_numpy()
+    total_revenue = float(fare.sum())
+    hour_counts = np.bincount(taxi_data['hour'].to_numpy(np.int64), minlength=24)
+
     return {
-        'total_trips': len(taxi_data),
-        'avg_fare': taxi_data['fare_amount'].mean(),
-        'avg_distance': taxi_data['trip_distance'].mean(),
-        'avg_duration': taxi_data['trip_duration_minutes'].mean(),
-        'total_revenue': taxi_data['fare_amount'].sum(),
-        'date_range': f"{taxi_data['date'].min()} to {taxi_data['date'].max()}",
-        'peak_hour': agg_data['hour_dow']['hour'].mode()[0] if len(agg_data['hour_dow']) > 0 else 0,
-        'busiest_borough': taxi_data['pickup_borough'].mode()[0] if len(taxi_data) > 0 else 'Unknown'
+        'total_trips': n,
+        'avg_fare': total_revenue / n,
+        'avg_distance': float(taxi_data['trip_distance'].to_numpy().mean()),
+        'avg_duration': float(taxi_data['trip_duration_minutes'].to_numpy().mean()),
+        'total_revenue': total_revenue,
+        'date_range': f"{pd.Timestamp(taxi_data['date'].min()).date()} to "
+                      f"{pd.Timestamp(taxi_data['date'].max()).date()}",
+        'peak_hour': int(hour_counts.argmax()),
+        'busiest_borough': taxi_data['pickup_borough'].value_counts().index[0]
     }
 
 